@@ -24,6 +24,7 @@ MetadataSession = sessionmaker(metadata_engine)
 from riweather.connection import NOAAFTPConnection
 from riweather.stations import (
     zcta_to_lat_lon,
+    zcta_to_lat_lon_many,
     rank_stations,
     select_station,
     Station,
@@ -1,6 +1,7 @@
 """Command line interface for riweather."""
 import functools
 import pathlib
+import shutil
 from importlib.resources import files
 
 import click
@@ -21,7 +22,7 @@ def _cli_download_metadata(filename: str, dst: pathlib.Path) -> pathlib.Path:
         contents = conn.read_file_as_bytes(filename)
 
     with open(outloc, "wb") as f:
-        f.write(contents.read())
+        shutil.copyfileobj(contents, f)
 
     return outloc
 
@@ -9,6 +9,12 @@ import requests
 
 from riweather import utils
 
+try:
+    # ISA-L decompresses several times faster than the standard library
+    from isal import igzip as _gzip
+except ImportError:
+    _gzip = gzip
+
 
 class NOAAFTPConnectionException(Exception):
     """Exception for bad FTP connections."""
@@ -87,6 +93,29 @@ class NOAAFTPConnection:
                 the case with many of NOAA's data files, then the results are
                 decompressed automatically using [gzip][].
         """
+        stream = self._download(filename)
+        if utils.is_compressed(filename):
+            return _gzip.open(stream, "rb")
+        else:
+            return stream
+
+    def read_file_contents(self, filename: str | os.PathLike) -> bytes:
+        """Read the entire contents of a file off of the server.
+
+        Args:
+            filename: The name/path of the file on the FTP server.
+
+        Returns:
+            The file contents. If `filename` ends with ".z" or ".gz", then the
+                results are decompressed automatically using [gzip][].
+        """
+        contents = self._download(filename).getvalue()
+        if utils.is_compressed(filename):
+            return _gzip.decompress(contents)
+        else:
+            return contents
+
+    def _download(self, filename: str | os.PathLike) -> BytesIO:
         if self.ftp is None:
             raise NOAAFTPConnectionException(
                 "FTP connection could not be established."
@@ -97,11 +126,7 @@ class NOAAFTPConnection:
             stream.seek(0)
         except ftplib.all_errors as e:
             raise NOAAFTPConnectionException(e) from e
-
-        if utils.is_compressed(filename):
-            return gzip.open(stream, "rb")
-        else:
-            return stream
+        return stream
 
 
 class NOAAHTTPConnectionException(Exception):
@@ -131,6 +156,21 @@ class NOAAHTTPConnection:
         self, filename: str | os.PathLike
     ) -> typing.IO | gzip.GzipFile:
         """Read a file off of the server and into a byte stream."""
+        stream = self._download(filename)
+        if utils.is_compressed(filename):
+            return _gzip.open(stream, "rb")
+        else:
+            return stream
+
+    def read_file_contents(self, filename: str | os.PathLike) -> bytes:
+        """Read the entire contents of a file off of the server."""
+        contents = self._download(filename).getvalue()
+        if utils.is_compressed(filename):
+            return _gzip.decompress(contents)
+        else:
+            return contents
+
+    def _download(self, filename: str | os.PathLike) -> BytesIO:
         stream = BytesIO()
         try:
             r = requests.get(f"{self.base_url}/{filename}", stream=True, timeout=15)
@@ -138,8 +178,4 @@ class NOAAHTTPConnection:
             stream.seek(0)
         except requests.exceptions.RequestException as e:
             raise NOAAHTTPConnectionException(e) from e
-
-        if utils.is_compressed(filename):
-            return gzip.open(stream, "rb")
-        else:
-            return stream
+        return stream
@@ -1,12 +1,13 @@
 """Weather station operations."""
-import operator
-from datetime import datetime
+import concurrent.futures
+import functools
+import typing
 
 import numpy as np
 import pandas as pd
 import pyproj
-import pytz
 from pandas.tseries.frequencies import to_offset
+from pandas.tseries.offsets import Day, Tick
 from sqlalchemy import select
 
 from riweather import MetadataSession
@@ -15,6 +16,7 @@ from riweather.db import models
 
 __all__ = (
     "zcta_to_lat_lon",
+    "zcta_to_lat_lon_many",
     "rank_stations",
     "select_station",
     "Station",
@@ -25,10 +27,263 @@ __all__ = (
     "rollup_instant",
 )
 
+_MAX_DOWNLOAD_WORKERS = 4
+_EARTH_RADIUS_M = 6_371_008.8
+_HAVERSINE_TOLERANCE = 0.01
+
+
+_ISD_MISSING_TEMP = np.frombuffer(b"+9999", dtype=np.uint8)
+_ISD_MIN_RECORD_LENGTH = 98
+
+
+def _is_digit(chars: np.ndarray) -> np.ndarray:
+    """Check which bytes are ASCII digits."""
+    return (chars >= ord("0")) & (chars <= ord("9"))
+
+
+def _parse_digits(chars: np.ndarray) -> np.ndarray:
+    """Read each run of ASCII digits along the last axis as a base-10 integer."""
+    weights = 10 ** np.arange(chars.shape[-1] - 1, -1, -1, dtype=np.int64)
+    return chars @ weights - ord("0") * weights.sum()
+
+
+def _parse_temps(chars: np.ndarray) -> np.ndarray:
+    """Convert signed ISD temperature fields (e.g. `-0028`) to degrees."""
+    sign = np.where(chars[..., 0] == ord("-"), -1, 1)
+    temps = sign * _parse_digits(chars[..., 1:]) / 10.0
+    temps[(chars == _ISD_MISSING_TEMP).all(axis=-1)] = np.nan
+    return temps
+
+
+def _parse_dates(chars: np.ndarray) -> np.ndarray:
+    """Convert ISD `YYYYMMDDHHMM` date fields to minute-level datetimes."""
+    years = _parse_digits(chars[:, 0:4])
+    months = _parse_digits(chars[:, 4:6])
+    days = _parse_digits(chars[:, 6:8])
+    minutes = _parse_digits(chars[:, 8:10]) * 60 + _parse_digits(chars[:, 10:12])
+
+    dates = ((years - 1970) * 12 + months - 1).astype("datetime64[M]")
+    dates = dates.astype("datetime64[D]") + (days - 1).astype("timedelta64[D]")
+    return dates.astype("datetime64[m]") + minutes.astype("timedelta64[m]")
+
+
+def _valid_dates(chars: np.ndarray) -> np.ndarray:
+    """Check which ISD `YYYYMMDDHHMM` date fields name a real date and time."""
+    years = _parse_digits(chars[:, 0:4])
+    months = _parse_digits(chars[:, 4:6])
+    days = _parse_digits(chars[:, 6:8])
+    hours = _parse_digits(chars[:, 8:10])
+    minutes = _parse_digits(chars[:, 10:12])
+
+    # clip so that out-of-range fields cannot overflow the month arithmetic
+    month_starts = (
+        (np.clip(years, 1, 9999) - 1970) * 12 + np.clip(months, 1, 12) - 1
+    ).astype("datetime64[M]")
+    first_days = month_starts.astype("datetime64[D]")
+    next_first_days = (month_starts + 1).astype("datetime64[D]")
+    days_in_month = (next_first_days - first_days).astype(np.int64)
+    return (
+        (years >= 1)
+        & (months >= 1)
+        & (months <= 12)
+        & (days >= 1)
+        & (days <= days_in_month)
+        & (hours < 24)
+        & (minutes < 60)
+    )
+
+
+def _parse_isd_temps(contents: bytes) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Extract timestamps, air temperatures and dew points from an ISD file.
+
+    ISD records vary in length, but the fields needed here all sit in the
+    fixed-width mandatory section at the start of each line. The whole file
+    is viewed as one byte array and those columns are gathered for every
+    line at once.
+
+    Raises:
+        ValueError: If a record is too short to hold the mandatory fields, its
+            date is not a valid date and time, or its temperature fields are
+            not numeric.
+    """
+    buf = np.frombuffer(contents, dtype=np.uint8)
+    newlines = np.flatnonzero(buf == ord("\n"))
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.concatenate((newlines, [len(buf)]))
+    keep = starts < len(buf)
+    starts, ends = starts[keep], ends[keep]
+
+    date_cols = np.arange(15, 27)
+    # air temperature and dew point are gathered and converted together
+    temp_cols = np.r_[87:92, 93:98].reshape(2, 5)
+
+    # only lines long enough to hold every field are gathered, so a short
+    # record cannot read bytes from the line after it
+    valid = ends - starts >= _ISD_MIN_RECORD_LENGTH
+    starts_ok = starts[valid]
+    dates = buf[starts_ok[:, np.newaxis] + date_cols]
+    temp_chars = buf[starts_ok[:, np.newaxis, np.newaxis] + temp_cols]
+    is_sign = (temp_chars[..., 0] == ord("+")) | (temp_chars[..., 0] == ord("-"))
+    valid[valid] = (
+        _is_digit(dates).all(axis=1)
+        & _valid_dates(dates)
+        & is_sign.all(axis=1)
+        & _is_digit(temp_chars[..., 1:]).all(axis=(1, 2))
+    )
+    if not valid.all():
+        bad = np.flatnonzero(~valid)[0]
+        record = bytes(buf[starts[bad] : ends[bad]])
+        raise ValueError(f"Malformed ISD record on line {bad + 1}: {record!r}")
+
+    timestamps = _parse_dates(dates)
+    temps, dews = _parse_temps(temp_chars).T
+    return timestamps, temps, dews
+
+
+def _fetch_isd_temps(
+    filenames: list[str], connector: type[NOAAFTPConnection | NOAAHTTPConnection]
+) -> list[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Download and parse a batch of ISD files over a single connection.
+
+    Each call opens its own connection so that several batches can be
+    retrieved concurrently from worker threads.
+    """
+    with connector() as conn:
+        return [
+            _parse_isd_temps(conn.read_file_contents(filename))
+            for filename in filenames
+        ]
 
-def _parse_temp(s: bytes) -> float:
-    value = float(s) / 10.0 if s.decode("utf-8") != "+9999" else float("nan")
-    return value
+
+def _average_duplicate_timestamps(
+    timestamps: np.ndarray, values: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Average the rows of sorted observations that share a timestamp.
+
+    Missing values are ignored, as with `groupby(...).mean()`. If every
+    timestamp is already unique the arrays are returned as-is.
+    """
+    is_first = np.empty(len(timestamps), dtype=bool)
+    is_first[:1] = True
+    np.not_equal(timestamps[1:], timestamps[:-1], out=is_first[1:])
+    if is_first.all():
+        return timestamps, values
+
+    starts = np.flatnonzero(is_first)
+    present = ~np.isnan(values)
+    sums = np.add.reduceat(np.where(present, values, 0.0), starts, axis=0)
+    counts = np.add.reduceat(present.astype(np.int64), starts, axis=0)
+    with np.errstate(invalid="ignore"):
+        means = sums / counts
+    return timestamps[starts], means
+
+
+def _as_columns(data: pd.Series | pd.DataFrame) -> np.ndarray:
+    """View a Series or DataFrame as a 2-D float array with one column per series."""
+    n_columns = 1 if isinstance(data, pd.Series) else data.shape[1]
+    return data.to_numpy(dtype=np.float64).reshape(len(data), n_columns)
+
+
+def _resample_mean(
+    data: pd.Series | pd.DataFrame,
+    period: str,
+    label: str | None = None,
+    closed: str | None = None,
+) -> pd.Series | pd.DataFrame:
+    """Average data over each period.
+
+    Equivalent to `data.resample(period, label=label, closed=closed).mean()`,
+    including pandas' per-frequency defaults when `label` or `closed` is
+    `None`. Fixed-width, sub-daily periods are binned directly with
+    [numpy.bincount][]; anything else is handed off to pandas.
+    """
+    freq = to_offset(period)
+    numeric = (
+        pd.api.types.is_numeric_dtype(data)
+        if isinstance(data, pd.Series)
+        else all(pd.api.types.is_numeric_dtype(t) for t in data.dtypes)
+    )
+    if (
+        not isinstance(freq, Tick)
+        or isinstance(freq, Day)
+        or not isinstance(data.index, pd.DatetimeIndex)
+        or len(data) == 0
+        or data.index.hasnans
+        or not numeric
+    ):
+        return data.resample(period, label=label, closed=closed).mean()
+
+    # pandas labels and closes fixed-width bins on the left by default
+    label = label or "left"
+    closed = closed or "left"
+
+    # bins are anchored to midnight of the earliest day, as with pandas' default
+    # `origin="start_day"`
+    step = freq.nanos
+    ix = data.index.as_unit("ns")
+    origin = ix.min().normalize().value
+    offsets = ix.asi8 - origin
+    if closed == "right":
+        bins = -(-offsets // step) - 1
+    else:
+        bins = offsets // step
+    first_bin = bins.min()
+    bins -= first_bin
+    n_bins = bins.max() + 1
+
+    values = _as_columns(data)
+    means = np.empty((n_bins, values.shape[1]))
+    for j in range(values.shape[1]):
+        present = ~np.isnan(values[:, j])
+        sums = np.bincount(bins[present], values[present, j], minlength=n_bins)
+        counts = np.bincount(bins[present], minlength=n_bins)
+        with np.errstate(invalid="ignore"):
+            means[:, j] = sums / counts
+
+    start = pd.Timestamp(origin + (first_bin + (label == "right")) * step)
+    if ix.tz is not None:
+        start = start.tz_localize("UTC").tz_convert(ix.tz)
+    index = pd.date_range(start, periods=n_bins, freq=freq, name=ix.name)
+    index = index.as_unit(data.index.unit)
+
+    if isinstance(data, pd.Series):
+        return pd.Series(means[:, 0], index=index, name=data.name)
+    return pd.DataFrame(means, index=index, columns=data.columns)
+
+
+def _interpolate_limited(
+    data: pd.Series | pd.DataFrame, limit: int
+) -> pd.Series | pd.DataFrame:
+    """Linearly interpolate missing values close to an observation.
+
+    Equivalent to
+    `data.interpolate(method="linear", limit=limit, limit_direction="both")`:
+    a missing value is filled if it is within `limit` steps of a non-missing
+    value on either side.
+    """
+    values = _as_columns(data).copy()
+    for j in range(values.shape[1]):
+        col = values[:, j]
+        observed = np.flatnonzero(~np.isnan(col))
+        missing = np.flatnonzero(np.isnan(col))
+        if len(observed) == 0 or len(missing) == 0:
+            continue
+
+        # position of the next observation after each missing value
+        nxt = np.searchsorted(observed, missing)
+        after = np.full(len(missing), np.inf)
+        has_next = nxt < len(observed)
+        after[has_next] = observed[nxt[has_next]] - missing[has_next]
+        before = np.full(len(missing), np.inf)
+        has_prev = nxt > 0
+        before[has_prev] = missing[has_prev] - observed[nxt[has_prev] - 1]
+
+        fill = missing[(before <= limit) | (after <= limit)]
+        col[fill] = np.interp(fill, observed, col[observed])
+
+    if isinstance(data, pd.Series):
+        return pd.Series(values[:, 0], index=data.index, name=data.name)
+    return pd.DataFrame(values, index=data.index, columns=data.columns)
 
 
 def upsample(data: pd.Series | pd.DataFrame, period: str = "min"):
@@ -59,11 +314,7 @@ def upsample(data: pd.Series | pd.DataFrame, period: str = "min"):
         2023-01-01 00:05:00     1.12500
         Freq: T, Length: 65, dtype: float64
     """
-    ts = (
-        data.resample(period)
-        .mean()
-        .interpolate(method="linear", limit=60, limit_direction="both")
-    )
+    ts = _interpolate_limited(_resample_mean(data, period), limit=60)
     return ts
 
 
@@ -98,7 +349,7 @@ def rollup_starting(
     """
     if upsample_first:
         data = upsample(data, period="min")
-    ts = data.resample(period, label="left", closed="left").mean()
+    ts = _resample_mean(data, period, label="left", closed="left")
     return ts
 
 
@@ -133,7 +384,7 @@ def rollup_ending(
     """
     if upsample_first:
         data = upsample(data, period="min")
-    ts = data.resample(period, label="right", closed="right").mean()
+    ts = _resample_mean(data, period, label="right", closed="right")
     return ts
 
 
@@ -169,10 +420,8 @@ def rollup_midpoint(
     if upsample_first:
         data = upsample(data, period="min")
     half_period = to_offset(to_offset(period).delta / 2)
-    ts = (
-        data.shift(freq=half_period)
-        .resample(period, label="left", closed="left")
-        .mean()
+    ts = _resample_mean(
+        data.shift(freq=half_period), period, label="left", closed="left"
     )
     return ts
 
@@ -240,13 +489,10 @@ class Station:  # noqa: D101
         Returns:
             A Station SQLAlchemy object.
         """
-        stmt = select(models.Station).where(models.Station.usaf_id == self.usaf_id)
-        with MetadataSession() as session:
-            station = session.scalars(stmt).first()
-            station_info = {
-                col: getattr(station, col) for col in station.__table__.columns.keys()
-            }
-            station_info["years"] = [f.year for f in station.filecounts]
+        station_info = dict(_load_station_metadata()[self.usaf_id])
+        station_info["years"] = list(
+            _load_years_by_station().get(station_info["id"], [])
+        )
 
         return station_info
 
@@ -396,32 +642,37 @@ class Station:  # noqa: D101
             2022-01-01 00:15:00+00:00   -2.8  -4.0
             2022-01-01 00:35:00+00:00   -4.2  -5.5
         """
-        data = []
         filenames = self.get_filenames(year)
         connector = NOAAHTTPConnection if use_http else NOAAFTPConnection
 
         if scale not in ("C", "F"):
             raise ValueError('Scale must be "C" (Celsius) or "F" (Fahrenheit).')
 
-        with connector() as conn:
-            for filename in filenames:
-                datastream = conn.read_file_as_bytes(filename)
-                for line in datastream.readlines():
-                    tempC = _parse_temp(line[87:92])
-                    dewC = _parse_temp(line[93:98])
-                    date_str = line[15:27].decode("utf-8")
-                    dt = pytz.UTC.localize(datetime.strptime(date_str, "%Y%m%d%H%M"))
-                    data.append([dt, tempC, dewC])
+        fetch = functools.partial(_fetch_isd_temps, connector=connector)
+        n_workers = max(1, min(_MAX_DOWNLOAD_WORKERS, len(filenames)))
+        batches = [filenames[i::n_workers] for i in range(n_workers)]
+        results = [None] * len(filenames)
+        with concurrent.futures.ThreadPoolExecutor(n_workers) as executor:
+            for i, batch in enumerate(executor.map(fetch, batches)):
+                results[i::n_workers] = batch
 
-        timestamps, temps, dews = zip(*sorted(data), strict=True)
-        ts = pd.DataFrame({"tempC": temps, "dewC": dews}, index=timestamps)
+        timestamps, temps, dews = (
+            np.concatenate(arrays) for arrays in zip(*results, strict=True)
+        )
+        values = np.column_stack((temps, dews))
+        # ISD files are usually in chronological order already
+        if (timestamps[1:] < timestamps[:-1]).any():
+            order = np.argsort(timestamps, kind="stable")
+            timestamps, values = timestamps[order], values[order]
 
+        timestamps, values = _average_duplicate_timestamps(timestamps, values)
         if scale == "F":
-            ts["tempF"] = ts["tempC"] * 1.8 + 32
-            ts["dewF"] = ts["dewC"] * 1.8 + 32
-            ts = ts.drop(["tempC", "dewC"], axis="columns")
+            values = values * 1.8 + 32
 
-        ts = ts.groupby(ts.index).mean()
+        index = pd.DatetimeIndex(timestamps.astype("datetime64[ns]"), tz="UTC")
+        ts = pd.DataFrame(
+            values, index=index, columns=[f"temp{scale}", f"dew{scale}"], copy=False
+        )
         return ts
 
     def fetch_temp_data(
@@ -479,6 +730,12 @@ class Station:  # noqa: D101
             raise ValueError("Invalid rollup")
 
         raw_ts = self.fetch_raw_temp_data(year, scale=scale, use_http=use_http)
+        # only carry the requested column through the rollup
+        if value == "temperature":
+            raw_ts = raw_ts[f"temp{scale}"]
+        elif value == "dew_point":
+            raw_ts = raw_ts[f"dew{scale}"]
+
         if rollup == "starting":
             ts = rollup_starting(raw_ts, period, upsample_first=upsample_first)
         elif rollup == "ending":
@@ -488,19 +745,19 @@ class Station:  # noqa: D101
         else:  # rollup == "instant"
             ts = rollup_instant(raw_ts, period, upsample_first=upsample_first)
 
-        if value == "temperature":
-            return ts.loc[:, f"temp{scale}"]
-        if value == "dew_point":
-            return ts.loc[:, f"dew{scale}"]
-        else:
-            return ts
+        return ts
 
     def __repr__(self):
         """String representation of a Station."""
         return f'Station("{self.usaf_id}")'
 
 
-def _calculate_distances(lat, lon):
+@functools.lru_cache(maxsize=1)
+def _load_station_coordinates() -> tuple[np.ndarray, ...]:
+    """Load the USAF ID, name, latitude and longitude of every station.
+
+    The arrays are cached for the life of the process and are read-only.
+    """
     stmt = select(
         models.Station.usaf_id,
         models.Station.name,
@@ -509,33 +766,120 @@ def _calculate_distances(lat, lon):
     )
 
     with MetadataSession() as session:
-        ids, names, lats, lons = zip(*session.execute(stmt), strict=True)
+        stations = pd.read_sql(stmt, session.connection())
+
+    arrays = (
+        stations["usaf_id"].to_numpy(),
+        stations["name"].to_numpy(),
+        stations["latitude"].to_numpy(dtype=np.float64),
+        stations["longitude"].to_numpy(dtype=np.float64),
+    )
+    for arr in arrays:
+        arr.setflags(write=False)
+    return arrays
+
+
+def _haversine_distances(lat, lon, lats, lons) -> np.ndarray:
+    """Great-circle distances, in meters, assuming a spherical Earth."""
+    lat, lon, lats, lons = map(np.radians, (lat, lon, lats, lons))
+    a = (
+        np.sin((lats - lat) / 2) ** 2
+        + np.cos(lat) * np.cos(lats) * np.sin((lons - lon) / 2) ** 2
+    )
+    return 2 * _EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _calculate_distances(lat, lon, max_distance_m=None):
+    ids, names, lats, lons = _load_station_coordinates()
+
+    if max_distance_m is not None:
+        # the spherical distance is within about 0.5% of the WGS84 geodesic, so
+        # only stations inside a slightly larger radius need the exact distance
+        near = _haversine_distances(lat, lon, lats, lons) <= max_distance_m * (
+            1 + _HAVERSINE_TOLERANCE
+        )
+        ids, names, lats, lons = ids[near], names[near], lats[near], lons[near]
 
-    target_lats = np.tile(lat, len(ids))
-    target_lons = np.tile(lon, len(ids))
     geod = pyproj.Geod(ellps="WGS84")
     _, _, dists = geod.inv(
-        target_lons,
-        target_lats,
+        np.broadcast_to(float(lon), lons.shape),
+        np.broadcast_to(float(lat), lats.shape),
         lons,
         lats,
         radians=False,
     )
 
-    data = [
-        {
-            "usaf_id": id,
-            "name": name,
-            "distance": dist,
-            "latitude": lat,
-            "longitude": lon,
-        }
-        for id, name, dist, lat, lon in zip(ids, names, dists, lats, lons, strict=True)
-    ]
+    return ids, names, lats, lons, np.asarray(dists)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_station_metadata() -> dict[str, dict]:
+    """Load the metadata of every station, keyed by USAF ID.
+
+    Loaded once per process, together with `_load_years_by_station`, so that
+    constructing many [`Station`][riweather.Station] objects does not query
+    the database each time.
+    """
+    with MetadataSession() as session:
+        rows = session.execute(select(models.Station.__table__)).mappings()
+        return {row["usaf_id"]: dict(row) for row in rows}
 
-    return [data[i] for i in np.argsort(dists)]
 
+@functools.lru_cache(maxsize=1)
+def _load_years_by_station() -> dict[int, list[int]]:
+    """Map each station's database ID to the years it has data files for.
 
+    A plain scan of the file count table in ID order, which is much cheaper
+    than the station join behind `_load_filecounts`.
+    """
+    stmt = select(models.FileCount.station_id, models.FileCount.year).order_by(
+        models.FileCount.id
+    )
+    with MetadataSession() as session:
+        rows = session.connection().execute(stmt).all()
+
+    years = {}
+    for station_id, year in rows:
+        years.setdefault(station_id, []).append(year)
+
+    return years
+
+
+@functools.lru_cache(maxsize=1)
+def _load_filecounts() -> dict[str, tuple[list[int], list[str]]]:
+    """Map each station's USAF ID to the years and quality ratings of its files.
+
+    The metadata database is read-only, so the join only needs to run once per
+    process.
+    """
+    stmt = select(
+        models.Station.usaf_id,
+        models.FileCount.year,
+        models.FileCount.quality,
+    ).join_from(models.Station, models.FileCount)
+
+    filecounts = {}
+    with MetadataSession() as session:
+        for usaf_id, year, quality in session.execute(stmt):
+            years, qualities = filecounts.setdefault(usaf_id, ([], []))
+            years.append(year)
+            qualities.append(quality)
+
+    return filecounts
+
+
+@functools.lru_cache(maxsize=1)
+def _load_station_years() -> pd.DataFrame:
+    """Table of which years (columns) each station (rows) has data for."""
+    filecounts = _load_filecounts()
+    usaf_ids = [usaf_id for usaf_id, (years, _) in filecounts.items() for _ in years]
+    years = [year for years, _ in filecounts.values() for year in years]
+
+    index = pd.MultiIndex.from_arrays([usaf_ids, years]).unique()
+    return pd.Series(True, index=index).unstack(fill_value=False)
+
+
+@functools.lru_cache(maxsize=None)
 def zcta_to_lat_lon(zcta: str) -> (float, float):
     """Convert zip code to lat/lon.
 
@@ -553,6 +897,28 @@ def zcta_to_lat_lon(zcta: str) -> (float, float):
     return zcta.latitude, zcta.longitude
 
 
+def zcta_to_lat_lon_many(
+    zctas: typing.Iterable[str],
+) -> dict[str, tuple[float, float]]:
+    """Convert several zip codes to lat/lon at once.
+
+    Args:
+        zctas: Five-digit zip codes
+
+    Returns:
+        A dictionary mapping each zip code to the center point of its ZCTA
+            (Zip Code Tabulation Area). Zip codes that are not found are left out.
+    """
+    with MetadataSession() as session:
+        rows = session.execute(
+            select(models.Zcta.zip, models.Zcta.latitude, models.Zcta.longitude).where(
+                models.Zcta.zip.in_(set(zctas))
+            )
+        ).all()
+
+    return {zcta: (lat, lon) for zcta, lat, lon in rows}
+
+
 def rank_stations(
     lat: float, lon: float, *, year: int = None, max_distance_m: int = None
 ) -> pd.DataFrame:
@@ -568,51 +934,44 @@ def rank_stations(
     Returns:
         A [DataFrame][pandas.DataFrame] of station information.
     """
-    station_info = {info["usaf_id"]: info for info in _calculate_distances(lat, lon)}
-
-    results = (
-        select(
-            models.Station.usaf_id,
-            models.Station.name,
-            models.FileCount.year,
-            models.FileCount.quality,
-        )
-        .join_from(
-            models.Station,
-            models.FileCount,
-        )
-        .where(models.Station.usaf_id.in_(station_info.keys()))
-    )
-
-    data = {}
-    with MetadataSession() as session:
-        for row in session.execute(results):
-            if row.usaf_id not in data.keys():
-                data[row.usaf_id] = {
-                    **station_info[row.usaf_id],
-                    "years": [],
-                    "quality": [],
-                }
-
-            data[row.usaf_id]["years"].append(row.year)
-            data[row.usaf_id]["quality"].append(row.quality)
-
-    data = pd.DataFrame(
-        sorted(data.values(), key=operator.itemgetter("distance"))
-    ).set_index("usaf_id")
+    ids, names, lats, lons, dists = _calculate_distances(lat, lon, max_distance_m)
+    filecounts = _load_filecounts()
 
+    # drop unwanted stations and sort the rest before building the frame
+    index = pd.Index(ids, name="usaf_id")
+    keep = index.isin(filecounts.keys())
     if year is not None:
-
-        def _filter_years(x):
-            if isinstance(year, list):
-                return all(y in x for y in year)
-            else:
-                return year in x
-
-        data = data.loc[data["years"].apply(_filter_years), :]
-
+        years = year if isinstance(year, list) else [year]
+        has_years = _load_station_years().reindex(
+            index=index, columns=years, fill_value=False
+        )
+        keep &= has_years.all(axis="columns").to_numpy()
     if max_distance_m is not None:
-        data = data.loc[data["distance"] <= max_distance_m, :]
+        keep &= dists <= max_distance_m
+    keep = np.flatnonzero(keep)
+    order = keep[np.argsort(dists[keep], kind="stable")]
+
+    index = index[order]
+    station_files = [filecounts[usaf_id] for usaf_id in index]
+    data = pd.DataFrame(
+        {
+            "name": names[order],
+            "distance": dists[order],
+            "latitude": lats[order],
+            "longitude": lons[order],
+            "years": pd.Series(
+                [list(file_years) for file_years, _ in station_files],
+                index=index,
+                dtype=object,
+            ),
+            "quality": pd.Series(
+                [list(quality) for _, quality in station_files],
+                index=index,
+                dtype=object,
+            ),
+        },
+        index=index,
+    )
 
     return data
 
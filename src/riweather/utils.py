@@ -1,5 +1,4 @@
 """Miscellaneous utility functions."""
-from urllib.parse import urlparse
 
 
 def is_compressed(filename):
@@ -27,7 +26,7 @@ def parse_s3_uri(s3uri: str) -> tuple[str, str]:
     Raises:
         ValueError: If `s3uri` does not begin with `"s3://"`.
     """
-    parts = urlparse(s3uri)
-    if parts.scheme != "s3":
+    if not s3uri.startswith("s3://"):
         raise ValueError("Not an S3 URI")
-    return parts.netloc, parts.path.removeprefix("/")
+    bucket, _, key = s3uri[5:].partition("/")
+    return bucket, key
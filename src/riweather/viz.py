@@ -4,17 +4,25 @@ import pandas as pd
 
 
 def _get_extent(lat, lon, tlats, tlons, buffer=0.05, max_aspect_ratio=1.5):
-    tlats.append(lat)
-    tlons.append(lon)
-    x_min, x_max = min(tlons) - buffer, max(tlons) + buffer
-    y_min, y_max = min(tlats) - buffer, max(tlats) + buffer
-
-    while (x_max - x_min) / (y_max - y_min) > max_aspect_ratio:
-        y_min -= buffer
-        y_max += buffer
-    while (y_max - y_min) / (x_max - x_min) > max_aspect_ratio:
-        x_min -= buffer
-        x_max += buffer
+    tlats = np.append(tlats, lat)
+    tlons = np.append(tlons, lon)
+    x_min, x_max = np.min(tlons) - buffer, np.max(tlons) + buffer
+    y_min, y_max = np.min(tlats) - buffer, np.max(tlats) + buffer
+
+    # widen the short side by whole buffers until the aspect ratio is satisfied,
+    # first vertically and then, since that can overshoot, horizontally
+    if (x_max - x_min) / (y_max - y_min) > max_aspect_ratio:
+        steps = np.ceil(
+            ((x_max - x_min) / max_aspect_ratio - (y_max - y_min)) / (2 * buffer)
+        )
+        y_min -= steps * buffer
+        y_max += steps * buffer
+    if (y_max - y_min) / (x_max - x_min) > max_aspect_ratio:
+        steps = np.ceil(
+            ((y_max - y_min) / max_aspect_ratio - (x_max - x_min)) / (2 * buffer)
+        )
+        x_min -= steps * buffer
+        x_max += steps * buffer
     return x_min, x_max, y_min, y_max
 
 
@@ -24,23 +32,21 @@ def _get_zoom_level(distance_m, n_tiles=600):
     return zoom_level
 
 
-def _calculate_distance_labels(distance_m, distance_unit):
-    if distance_unit not in ("m", "km", "mi"):
-        raise ValueError("Invalid distance unit. Must be m, km, or mi")
+_UNIT_SPEC = {
+    "m": (1.0, "{:,.0f} m"),
+    "km": (1000.0, "{:,.1f} km"),
+    "mi": (1609.344, "{:,.1f} mi"),
+}
+
 
-    if distance_unit == "m":
-        distance = distance_m
-        dist_str = "{:,.0f} m".format(distance)
-    elif distance_unit == "km":
-        distance = distance_m / 1000.0
-        dist_str = "{:,.1f} km".format(distance)
-    elif distance_unit == "mi":
-        distance = distance_m / 1609.344
-        dist_str = "{:,.1f} mi".format(distance)
-    else:
-        raise ValueError("Invalid distance unit. Must be m, km, or mi")
+def _calculate_distance_labels(distance_m, distance_unit):
+    try:
+        meters_per_unit, fmt = _UNIT_SPEC[distance_unit]
+    except KeyError:
+        raise ValueError("Invalid distance unit. Must be m, km, or mi") from None
 
-    return dist_str
+    distances = np.asarray(distance_m) / meters_per_unit
+    return [fmt.format(d) for d in distances.tolist()]
 
 
 def plot_stations(
@@ -81,15 +87,22 @@ def plot_stations(
 
     m = folium.Map(location=[lat, lon])
     folium.Marker([lat, lon], popup="Site").add_to(m)
-    for row in station_info.itertuples():
-        folium.Marker(
-            [row.latitude, row.longitude],
-            popup=row.name,
-            icon=folium.Icon(icon="cloud"),
-        ).add_to(m)
-        folium.PolyLine(
-            [[lat, lon], [row.latitude, row.longitude]],
-            popup=_calculate_distance_labels(row.distance, distance_unit),
-        ).add_to(m)
+    labels = _calculate_distance_labels(station_info["distance"], distance_unit)
+    fg = folium.FeatureGroup(name="stations")
+    for row, label in zip(station_info.itertuples(), labels, strict=True):
+        fg.add_child(
+            folium.Marker(
+                [row.latitude, row.longitude],
+                popup=row.name,
+                icon=folium.Icon(icon="cloud"),
+            )
+        )
+        fg.add_child(
+            folium.PolyLine(
+                [[lat, lon], [row.latitude, row.longitude]],
+                popup=label,
+            )
+        )
+    m.add_child(fg)
 
     return m
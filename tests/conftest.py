@@ -4,8 +4,13 @@ import os
 import tempfile
 
 import pytest
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
 
-from riweather import utils
+from riweather import connection, utils
+from riweather.db import Base
+from riweather.db.models import FileCount, Station, Zcta
 
 
 def pytest_configure(config):
@@ -23,20 +28,33 @@ def mock_requests_get(module_mocker):
     return mock
 
 
-@pytest.fixture(scope="module", autouse=True)
-def mock_ftp(module_mocker):
-    """Mocked ftplib.FTP object."""
-
-    def _side_effect(cmd, callback):
-        contents = b"mock file contents"
-        if utils.is_compressed(cmd):
-            contents = gzip.compress(b"compressed " + contents)
-        return callback(contents)
-
-    mock = module_mocker.patch("ftplib.FTP", autospec=True)
-    mock.return_value.retrbinary.side_effect = _side_effect
-    mock.return_value.getwelcome.return_value = b"Welcome to the mock FTP server!"
-    return mock
+def _mock_retrbinary(cmd, callback):
+    contents = b"mock file contents"
+    if utils.is_compressed(cmd):
+        contents = gzip.compress(b"compressed " + contents)
+    return callback(contents)
+
+
+@pytest.fixture(scope="session")
+def ftp_class(session_mocker):
+    """Autospec of ftplib.FTP, patched in once for the whole test run."""
+    return session_mocker.patch("ftplib.FTP", autospec=True)
+
+
+@pytest.fixture(autouse=True)
+def mock_ftp(ftp_class):
+    """Mocked ftplib.FTP object, reset before each test."""
+    ftp_class.reset_mock(side_effect=True)
+    ftp_class.return_value.retrbinary.side_effect = _mock_retrbinary
+    ftp_class.return_value.getwelcome.return_value = b"Welcome to the mock FTP server!"
+    return ftp_class
+
+
+@pytest.fixture
+def ftp_conn(mock_ftp):
+    """An open connection to the mocked FTP server."""
+    with connection.NOAAFTPConnection() as conn:
+        yield conn
 
 
 @pytest.fixture
@@ -47,3 +65,110 @@ def cleandir():
         os.chdir(newpath)
         yield
         os.chdir(old_cwd)
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """In-memory database engine, with the schema created once per test run."""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    @event.listens_for(engine, "connect")
+    def _configure_connection(dbapi_connection, connection_record):
+        # let SQLAlchemy, not pysqlite, issue BEGIN so that savepoints roll back
+        dbapi_connection.isolation_level = None
+        # durability is irrelevant for a throwaway test database
+        dbapi_connection.executescript(
+            "PRAGMA synchronous=OFF;"
+            "PRAGMA journal_mode=MEMORY;"
+            "PRAGMA temp_store=MEMORY;"
+            "PRAGMA cache_size=-65536;"
+        )
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    """Database session whose changes are rolled back after each test."""
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        session = Session(bind=connection, join_transaction_mode="create_savepoint")
+        yield session
+        session.close()
+        transaction.rollback()
+
+
+@pytest.fixture(scope="session")
+def valid_zcta():
+    """A sample valid ZCTA database row."""
+    return dict(
+        id=1,
+        zip="35768",
+        latitude=34.77851579407223,
+        longitude=-86.10382679364129,
+        county_id="01071",
+        state="AL",
+    )
+
+
+@pytest.fixture(scope="session")
+def valid_station():
+    """A sample valid Station database row."""
+    return dict(
+        id=1,
+        usaf_id="690150",
+        wban_ids="93121,99999",
+        recent_wban_id="93121",
+        name="TWENTY NINE PALMS",
+        icao_code="KNXP",
+        latitude=34.294,
+        longitude=-116.147,
+        elevation=610.5,
+        state="CA",
+    )
+
+
+@pytest.fixture(scope="session")
+def valid_filecount(valid_station):
+    """A sample valid FileCount database row."""
+    return dict(
+        id=1,
+        wban_id="93121",
+        station_id=valid_station["id"],
+        year=2006,
+        jan=493,
+        feb=441,
+        mar=518,
+        apr=480,
+        may=482,
+        jun=518,
+        jul=550,
+        aug=509,
+        sep=483,
+        oct=587,
+        nov=702,
+        dec=732,
+        count=6495,
+        n_zero_months=0,
+        quality="medium",
+    )
+
+
+@pytest.fixture(scope="session")
+def seed_data(engine, valid_station, valid_filecount, valid_zcta):
+    """Insert the sample rows into the test database once per test run."""
+    with Session(engine) as session:
+        session.execute(insert(Station), [valid_station])
+        session.execute(insert(FileCount), [valid_filecount])
+        session.execute(insert(Zcta), [valid_zcta])
+        session.commit()
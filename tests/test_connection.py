@@ -1,5 +1,7 @@
 """Test module for the FTP connections."""
 import ftplib
+import gzip
+import types
 
 import pytest
 
@@ -15,10 +17,9 @@ def test_connection_ftp_login_welcome(mock_ftp):
     assert welcome == b"Welcome to the mock FTP server!"
 
 
-def test_ftp_calls_retrbinary(mock_ftp):
+def test_ftp_calls_retrbinary(ftp_conn, mock_ftp):
     """Makes a RETR call to the server."""
-    with connection.NOAAFTPConnection() as conn:
-        conn.read_file_as_bytes("/some/path/to/data.csv")
+    ftp_conn.read_file_as_bytes("/some/path/to/data.csv")
 
     assert (
         mock_ftp.return_value.retrbinary.call_args.args[0]
@@ -26,22 +27,51 @@ def test_ftp_calls_retrbinary(mock_ftp):
     )
 
 
-def test_ftp_retrieves_uncompressed_data(mock_ftp):
+def test_ftp_retrieves_uncompressed_data(ftp_conn):
     """Retrieves data from an uncompressed file."""
-    with connection.NOAAFTPConnection() as conn:
-        contents = conn.read_file_as_bytes("/some/path/to/data.csv")
+    contents = ftp_conn.read_file_as_bytes("/some/path/to/data.csv")
 
     assert contents.read() == b"mock file contents"
 
 
-def test_ftp_retrieves_compressed_data(mock_ftp):
+def test_ftp_retrieves_compressed_data(ftp_conn):
     """Retrieves data from a compressed file."""
-    with connection.NOAAFTPConnection() as conn:
-        contents = conn.read_file_as_bytes("/some/path/to/data.csv.z")
+    contents = ftp_conn.read_file_as_bytes("/some/path/to/data.csv.z")
 
     assert contents.read() == b"compressed mock file contents"
 
 
+@pytest.mark.parametrize(
+    "filename,expected",
+    [
+        ("/some/path/to/data.csv", b"mock file contents"),
+        ("/some/path/to/data.csv.z", b"compressed mock file contents"),
+    ],
+)
+def test_ftp_reads_file_contents(ftp_conn, filename, expected):
+    """Reads the whole file, decompressing it if needed."""
+    contents = ftp_conn.read_file_contents(filename)
+
+    assert contents == expected
+
+
+def test_ftp_uses_gzip_backend(ftp_conn, monkeypatch):
+    """Decompresses files with whichever gzip backend was imported."""
+    calls = []
+
+    def _decompress(data):
+        calls.append(data)
+        return gzip.decompress(data)
+
+    monkeypatch.setattr(
+        connection, "_gzip", types.SimpleNamespace(decompress=_decompress)
+    )
+    contents = ftp_conn.read_file_contents("/some/path/to/data.csv.z")
+
+    assert contents == b"compressed mock file contents"
+    assert len(calls) == 1
+
+
 def test_ftp_bad_connection_errors_out(mock_ftp):
     """Fails gracefully in the event of an FTP error."""
     mock_ftp.side_effect = OSError
@@ -1,79 +1,14 @@
 """Test module for the metadata database."""
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
 
-from riweather.db import Base
 from riweather.db.models import FileCount, Station, Zcta
 
 
-@pytest.fixture(scope="module")
-def session():
-    """In-memory database session for testing."""
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(engine)
-    session = Session(engine)
-    yield session
-    session.rollback()
-    session.close()
-
-
-@pytest.fixture(scope="module")
-def valid_zcta():
-    """A sample valid ZCTA database object."""
-    zcta = Zcta(
-        zip="35768",
-        latitude=34.77851579407223,
-        longitude=-86.10382679364129,
-        county_id="01071",
-        state="AL",
-    )
-    return zcta
-
-
-@pytest.fixture(scope="module")
-def valid_station():
-    """A sample valid Station database object."""
-    station = Station(
-        usaf_id="690150",
-        wban_ids="93121,99999",
-        recent_wban_id="93121",
-        name="TWENTY NINE PALMS",
-        icao_code="KNXP",
-        latitude=34.294,
-        longitude=-116.147,
-        elevation=610.5,
-        state="CA",
-    )
-    return station
-
-
-@pytest.fixture(scope="module")
-def valid_filecount(valid_station):
-    """A sample valid FileCount database object."""
-    file = FileCount(
-        wban_id="93121",
-        station=valid_station,
-        year=2006,
-        jan=493,
-        feb=441,
-        mar=518,
-        apr=480,
-        may=482,
-        jun=518,
-        jul=550,
-        aug=509,
-        sep=483,
-        oct=587,
-        nov=702,
-        dec=732,
-        count=6495,
-        n_zero_months=0,
-        quality="medium",
-    )
-    return file
+def _row(obj, columns):
+    return {col: getattr(obj, col) for col in columns}
 
 
+@pytest.mark.usefixtures("seed_data")
 class TestDatabase:
     """Test cases for the database."""
 
@@ -81,27 +16,26 @@ class TestDatabase:
         """The connection was successful."""
         assert session.is_active
 
-    def test_db_add_valid_station(self, session, valid_station):
-        """A valid station can be inserted."""
-        session.add(valid_station)
-        session.commit()
-        station = (
-            session.query(Station).filter_by(usaf_id=valid_station.usaf_id).first()
-        )
-        assert station == valid_station
-
-    def test_db_add_valid_file(self, session, valid_filecount):
-        """A valid file can be inserted."""
-        session.add(valid_filecount)
-        session.commit()
-        file = (
-            session.query(FileCount).filter_by(wban_id=valid_filecount.wban_id).first()
-        )
-        assert file == valid_filecount
-
-    def test_db_add_valid_zcta(self, session, valid_zcta):
-        """A valid ZCTA can be inserted."""
-        session.add(valid_zcta)
-        session.commit()
-        zcta = session.query(Zcta).filter_by(zip=valid_zcta.zip).first()
-        assert zcta == valid_zcta
+    def test_db_reads_seeded_station(self, session, valid_station):
+        """The seeded station can be read back intact."""
+        station = session.get(Station, valid_station["id"])
+        assert _row(station, valid_station) == valid_station
+
+    def test_db_reads_seeded_file(self, session, valid_filecount, valid_station):
+        """The seeded file count can be read back with its station."""
+        file = session.get(FileCount, valid_filecount["id"])
+        assert _row(file, valid_filecount) == valid_filecount
+        assert file.station.usaf_id == valid_station["usaf_id"]
+
+    def test_db_reads_seeded_zcta(self, session, valid_zcta):
+        """The seeded ZCTA can be read back intact."""
+        zcta = session.get(Zcta, valid_zcta["id"])
+        assert _row(zcta, valid_zcta) == valid_zcta
+
+    def test_db_add_new_station(self, session, valid_station):
+        """A new station can be added through the ORM."""
+        station = Station(**{**valid_station, "id": None, "usaf_id": "999999"})
+        session.add(station)
+        session.flush()
+        assert station in session
+        assert session.get(Station, station.id) is station
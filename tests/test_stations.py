@@ -0,0 +1,391 @@
+"""Test module for weather station operations."""
+import functools
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.tseries.frequencies import to_offset
+
+from riweather import stations
+
+ISD_RECORDS = (
+    b"0000720534001612022010100154+40017-105050FM-15+1564KEIK V0202501N00411"
+    b"2200019N016093199-00281-00401999999ADDGA1001+999999999MA1999999999999REMMET\n"
+    b"0000720534001612022010100354+40017-105050FM-15+1564KEIK V0202501N00411"
+    b"2200019N016093199-00421-00551999999\n"
+    b"0000720534001612021123123554+40017-105050FM-15+1564KEIK V0202501N00411"
+    b"2200019N016093199+99991+00101999999ADD\n"
+)
+ISD_TIMESTAMPS = np.array(
+    ["2022-01-01T00:15", "2022-01-01T00:35", "2021-12-31T23:55"],
+    dtype="datetime64[m]",
+)
+ISD_TEMPS = np.array([-2.8, -4.2, np.nan])
+ISD_DEWS = np.array([-4.0, -5.5, 1.0])
+for _expected in (ISD_TIMESTAMPS, ISD_TEMPS, ISD_DEWS):
+    _expected.flags.writeable = False
+
+
+@pytest.fixture(scope="module")
+def parsed_isd():
+    """Sample ISD records, parsed once for every test that reads them."""
+    return stations._parse_isd_temps(ISD_RECORDS)
+
+
+class TestParseISD:
+    """Test cases for parsing raw ISD files."""
+
+    @pytest.mark.parametrize(
+        "field,expected",
+        [(0, ISD_TIMESTAMPS), (1, ISD_TEMPS), (2, ISD_DEWS)],
+        ids=["timestamps", "temperatures", "dew_points"],
+    )
+    def test_parses_fields(self, parsed_isd, field, expected):
+        """Reads observation times, and air and dew point temperatures in Celsius."""
+        np.testing.assert_array_equal(parsed_isd[field], expected)
+
+    def test_no_trailing_newline(self):
+        """Reads the last record even if the file does not end in a newline."""
+        timestamps, _, _ = stations._parse_isd_temps(ISD_RECORDS.rstrip(b"\n"))
+        assert len(timestamps) == 3
+
+    @pytest.mark.parametrize(
+        "records,line",
+        [
+            (ISD_RECORDS.replace(b"\n", b"\n" + b"0" * 50 + b"\n", 1), 2),
+            (ISD_RECORDS + b"0" * 50, 4),
+            (ISD_RECORDS.replace(b"-00281", b"-0X281", 1), 1),
+            (ISD_RECORDS.replace(b"-00421", b"*00421", 1), 2),
+            (ISD_RECORDS.replace(b"202112312355", b"2021-2312355", 1), 3),
+            (ISD_RECORDS.replace(b"202201010015", b"202213010015", 1), 1),
+            (ISD_RECORDS.replace(b"202201010035", b"202202300035", 1), 2),
+            (ISD_RECORDS.replace(b"202112312355", b"202112320055", 1), 3),
+            (ISD_RECORDS.replace(b"202201010015", b"202201019915", 1), 1),
+            (ISD_RECORDS.replace(b"202201010035", b"202201010060", 1), 2),
+        ],
+        ids=[
+            "short_middle",
+            "short_last",
+            "bad_digit",
+            "bad_sign",
+            "bad_date",
+            "bad_month",
+            "bad_february_day",
+            "bad_day",
+            "bad_hour",
+            "bad_minute",
+        ],
+    )
+    def test_malformed_record(self, records, line):
+        """Raises an error naming the bad record instead of misreading it."""
+        with pytest.raises(ValueError, match=f"Malformed ISD record on line {line}:"):
+            stations._parse_isd_temps(records)
+
+    def test_empty_file(self):
+        """Returns empty arrays for an empty file."""
+        timestamps, temps, dews = stations._parse_isd_temps(b"")
+        assert len(timestamps) == len(temps) == len(dews) == 0
+
+
+class TestAverageDuplicates:
+    """Test cases for collapsing observations that share a timestamp."""
+
+    def test_averages_duplicates(self):
+        """Duplicate timestamps are averaged, ignoring missing values."""
+        timestamps = np.array(
+            ["2022-01-01T00:15", "2022-01-01T00:15", "2022-01-01T00:35"],
+            dtype="datetime64[m]",
+        )
+        values = np.array([[1.0, np.nan], [2.0, 3.0], [4.0, 5.0]])
+        result_ts, result_values = stations._average_duplicate_timestamps(
+            timestamps, values
+        )
+        np.testing.assert_array_equal(result_ts, timestamps[1:])
+        np.testing.assert_array_equal(result_values, [[1.5, 3.0], [4.0, 5.0]])
+
+    def test_unique_timestamps_unchanged(self):
+        """Data with no duplicate timestamps is passed through untouched."""
+        timestamps = np.array(
+            ["2022-01-01T00:15", "2022-01-01T00:35"], dtype="datetime64[m]"
+        )
+        values = np.array([[1.0, 2.0], [3.0, 4.0]])
+        result_ts, result_values = stations._average_duplicate_timestamps(
+            timestamps, values
+        )
+        assert result_ts is timestamps
+        assert result_values is values
+
+
+class FakeISDConnection:
+    """Connection stand-in that serves the same ISD records for any file."""
+
+    def __enter__(self):
+        """Connect."""
+        return self
+
+    def __exit__(self, *args):
+        """Disconnect."""
+        pass
+
+    def read_file_contents(self, filename):
+        """Return the sample ISD records."""
+        return ISD_RECORDS
+
+
+@pytest.fixture(scope="module")
+def stn():
+    """A sample station, shared by tests that do not modify it."""
+    return stations.Station("720534")
+
+
+@pytest.fixture(scope="module")
+def fetch_raw(stn, module_mocker):
+    """Fetch raw temperatures from sample ISD records, once per set of arguments."""
+    module_mocker.patch.object(stations, "NOAAFTPConnection", FakeISDConnection)
+
+    @functools.lru_cache
+    def _fetch(year=None, scale="C"):
+        return stn.fetch_raw_temp_data(year, scale=scale)
+
+    def fetch(year=None, scale="C"):
+        return _fetch(year, scale).copy()
+
+    return fetch
+
+
+class TestFetchRawTempData:
+    """Test cases for retrieving raw temperature data."""
+
+    def test_sorted_by_time(self, fetch_raw):
+        """Observations are returned in chronological order."""
+        ts = fetch_raw(2022)
+        assert ts.index.is_monotonic_increasing
+        assert str(ts.index.tz) == "UTC"
+        assert ts.loc["2022-01-01 00:15", "tempC"].item() == -2.8
+
+    def test_multiple_files(self, stn, fetch_raw):
+        """Observations repeated across files are averaged together."""
+        assert len(stn.get_filenames()) > 1
+        ts = fetch_raw()
+        assert len(ts) == 3
+
+    @pytest.mark.parametrize("scale,dew_point", [("C", 1.0), ("F", 33.8)])
+    def test_scale(self, fetch_raw, scale, dew_point):
+        """Temperatures can be returned in Celsius or Fahrenheit."""
+        ts = fetch_raw(2022, scale=scale)
+        assert list(ts.columns) == [f"temp{scale}", f"dew{scale}"]
+        assert ts[f"dew{scale}"].iloc[0] == pytest.approx(dew_point)
+
+
+@pytest.fixture(scope="module")
+def raw_temps():
+    """Irregular temperatures with a gap longer than the interpolation limit."""
+    index = pd.DatetimeIndex(
+        [
+            "2023-01-01 00:01",
+            "2023-01-01 00:33",
+            "2023-01-01 01:05",
+            "2023-01-01 05:10",
+            "2023-01-01 05:42",
+        ],
+        tz="UTC",
+    )
+    return pd.DataFrame(
+        {
+            "tempC": [1.0, 2.0, 10.0, 4.0, np.nan],
+            "dewC": [np.nan, -1.0, 3.0, 0.5, 2.0],
+        },
+        index=index,
+    )
+
+
+@pytest.fixture(scope="module")
+def upsampled(raw_temps):
+    """The irregular temperatures upsampled to one-minute intervals."""
+    return stations.upsample(raw_temps)
+
+
+class TestUpsample:
+    """Test cases for upsampling and interpolating time series."""
+
+    def test_matches_pandas(self, raw_temps, upsampled):
+        """Gives the same result as resampling and interpolating with pandas."""
+        expected = (
+            raw_temps.resample("min")
+            .mean()
+            .interpolate(method="linear", limit=60, limit_direction="both")
+        )
+        pd.testing.assert_frame_equal(upsampled, expected)
+
+    @pytest.mark.parametrize(
+        "period", [pd.offsets.MonthEnd(), "W"], ids=["month", "week"]
+    )
+    def test_calendar_period_matches_pandas(self, unsorted_temps, period):
+        """Calendar periods keep pandas' own labelling and bin edges."""
+        expected = (
+            unsorted_temps.resample(period)
+            .mean()
+            .interpolate(method="linear", limit=60, limit_direction="both")
+        )
+        pd.testing.assert_frame_equal(
+            stations.upsample(unsorted_temps, period), expected
+        )
+
+    @pytest.mark.parametrize(
+        "rollup,label,closed",
+        [
+            (stations.rollup_starting, "left", "left"),
+            (stations.rollup_ending, "right", "right"),
+        ],
+    )
+    def test_rollup_matches_pandas(self, raw_temps, upsampled, rollup, label, closed):
+        """Period averages are the same as those calculated by pandas."""
+        expected = upsampled.resample("h", label=label, closed=closed).mean()
+        pd.testing.assert_frame_equal(rollup(raw_temps, "h"), expected)
+
+
+@pytest.fixture(scope="module")
+def unsorted_temps():
+    """Temperatures spanning two days, out of chronological order."""
+    index = pd.DatetimeIndex(
+        [
+            "2023-01-02 20:10",
+            "2023-01-01 03:05",
+            "2023-01-02 06:40",
+            "2023-01-01 15:25",
+            "2023-01-01 09:55",
+            "2023-01-02 13:30",
+        ],
+        tz="UTC",
+    )
+    return pd.DataFrame(
+        {
+            "tempC": [1.0, 2.0, np.nan, 4.0, 5.0, 6.0],
+            "dewC": [-1.0, np.nan, 0.5, -2.0, 3.0, 1.5],
+        },
+        index=index,
+    )
+
+
+def _pandas_rollup(data, period, rollup):
+    """Roll up data with pandas alone, as a reference result."""
+    if rollup == "midpoint":
+        half_period = to_offset(to_offset(period).delta / 2)
+        return data.shift(freq=half_period).resample(period).mean()
+    if rollup == "ending":
+        return data.resample(period, label="right", closed="right").mean()
+    return data.resample(period, label="left", closed="left").mean()
+
+
+class TestRollup:
+    """Test cases for rolling up data to a coarser period."""
+
+    @pytest.mark.parametrize("rollup", ["starting", "ending", "midpoint"])
+    @pytest.mark.parametrize("as_frame", [False, True], ids=["series", "frame"])
+    def test_empty(self, rollup, as_frame):
+        """Empty data rolls up to an empty result, as with pandas."""
+        data = pd.Series([], index=pd.DatetimeIndex([], tz="UTC"), dtype=float)
+        if as_frame:
+            data = data.to_frame("tempC")
+        result = getattr(stations, f"rollup_{rollup}")(data, "h")
+        expected = _pandas_rollup(data.resample("min").mean(), "h", rollup)
+        if as_frame:
+            pd.testing.assert_frame_equal(result, expected)
+        else:
+            pd.testing.assert_series_equal(result, expected)
+
+    @pytest.mark.parametrize("rollup", ["starting", "ending", "midpoint"])
+    @pytest.mark.parametrize("upsample_first", [False, True])
+    def test_missing_timestamp(self, rollup, upsample_first):
+        """Observations without a timestamp are dropped, as with pandas."""
+        data = pd.Series(
+            [1.0, 2.0, 3.0],
+            index=pd.DatetimeIndex(["2023-01-01 00:01", pd.NaT, "2023-01-01 01:05"]),
+        )
+        result = getattr(stations, f"rollup_{rollup}")(
+            data, "h", upsample_first=upsample_first
+        )
+        if upsample_first:
+            data = (
+                data.resample("min")
+                .mean()
+                .interpolate(method="linear", limit=60, limit_direction="both")
+            )
+        pd.testing.assert_series_equal(result, _pandas_rollup(data, "h", rollup))
+
+    @pytest.mark.parametrize("period", ["h", "5h", "7h"])
+    @pytest.mark.parametrize("rollup", ["starting", "ending", "midpoint"])
+    def test_unsorted_matches_pandas(self, unsorted_temps, rollup, period):
+        """Unsorted data is binned from midnight of its earliest day."""
+        result = getattr(stations, f"rollup_{rollup}")(
+            unsorted_temps, period, upsample_first=False
+        )
+        expected = _pandas_rollup(unsorted_temps, period, rollup)
+        pd.testing.assert_frame_equal(result, expected)
+
+
+class TestRankStations:
+    """Test cases for ranking stations by distance."""
+
+    def test_sorted_by_distance(self):
+        """Stations are ordered nearest first."""
+        ranked = stations.rank_stations(40.0, -105.0)
+        assert ranked["distance"].is_monotonic_increasing
+
+    @pytest.mark.parametrize("max_distance_m", [0, 50_000, 500_000])
+    def test_max_distance(self, max_distance_m):
+        """Limiting the distance gives the same stations as filtering afterwards."""
+        ranked = stations.rank_stations(40.0, -105.0)
+        expected = ranked.loc[ranked["distance"] <= max_distance_m, :]
+        result = stations.rank_stations(40.0, -105.0, max_distance_m=max_distance_m)
+        pd.testing.assert_frame_equal(result, expected)
+
+    @pytest.mark.parametrize("year", [2022, [2020, 2021]])
+    def test_year(self, year):
+        """Only stations with data for every requested year are included."""
+        ranked = stations.rank_stations(40.0, -105.0, year=year)
+        years = year if isinstance(year, list) else [year]
+        assert len(ranked) > 0
+        assert all(set(years) <= set(y) for y in ranked["years"])
+
+
+class TestZcta:
+    """Test cases for looking up zip code locations."""
+
+    def test_zcta_to_lat_lon(self):
+        """Returns the center point of a zip code."""
+        lat, lon = stations.zcta_to_lat_lon("15301")
+        assert (lat, lon) == pytest.approx((40.1641, -80.2530), abs=1e-4)
+
+    def test_zcta_to_lat_lon_many(self):
+        """Looks up several zip codes at once, leaving out unknown ones."""
+        result = stations.zcta_to_lat_lon_many(["15301", "15658", "00000"])
+        assert result == {
+            "15301": stations.zcta_to_lat_lon("15301"),
+            "15658": stations.zcta_to_lat_lon("15658"),
+        }
+
+
+class TestStation:
+    """Test cases for the Station object."""
+
+    def test_loads_metadata(self, stn):
+        """Station metadata is read from the local data store."""
+        assert stn.name == "ERIE MUNICIPAL AIRPORT"
+        assert (stn.latitude, stn.longitude) == (40.017, -105.05)
+        assert 2022 in stn.years
+
+    def test_metadata_is_cached(self, monkeypatch):
+        """Stations after the first are built without querying the database."""
+        stations.Station("720534")
+        monkeypatch.setattr(stations, "MetadataSession", None)
+        s = stations.Station("720565")
+        assert s.usaf_id == "720565"
+        assert len(s.years) > 0
+
+    def test_metadata_is_not_shared(self):
+        """Changing one Station's metadata does not affect another."""
+        s1 = stations.Station("720534")
+        s1.years.append(1800)
+        s2 = stations.Station("720534")
+        assert 1800 not in s2.years
@@ -0,0 +1,24 @@
+"""Test module for utility functions."""
+import pytest
+
+from riweather import utils
+
+
+@pytest.mark.parametrize(
+    "s3uri,expected",
+    [
+        ("s3://bucket/path/to/key.txt", ("bucket", "path/to/key.txt")),
+        ("s3://bucket/", ("bucket", "")),
+        ("s3://bucket", ("bucket", "")),
+    ],
+)
+def test_parse_s3_uri(s3uri, expected):
+    """Splits an S3 URI into its bucket and key."""
+    assert utils.parse_s3_uri(s3uri) == expected
+
+
+@pytest.mark.parametrize("s3uri", ["https://bucket/key", "bucket/key"])
+def test_parse_s3_uri_invalid(s3uri):
+    """Rejects URIs that are not S3 URIs."""
+    with pytest.raises(ValueError, match="Not an S3 URI"):
+        utils.parse_s3_uri(s3uri)
@@ -0,0 +1,59 @@
+"""Test module for visualization helpers."""
+import pytest
+
+from riweather import viz
+
+
+class TestGetExtent:
+    """Test cases for calculating the map extent."""
+
+    @pytest.mark.parametrize(
+        "tlats,tlons,kwargs,expected",
+        [
+            ([0.1], [0.2], {}, (-0.05, 0.25, -0.05, 0.15)),
+            ([3.0], [0.2], {}, (-0.95, 1.15, -0.05, 3.05)),
+            (
+                [0.0],
+                [1.0],
+                {"buffer": 1.0, "max_aspect_ratio": 1.2},
+                (-2.0, 3.0, -2.0, 2.0),
+            ),
+        ],
+        ids=["within_ratio", "too_tall", "widen_after_overshoot"],
+    )
+    def test_extent(self, tlats, tlons, kwargs, expected):
+        """Pads the short side of the extent in whole buffers."""
+        assert viz._get_extent(0.0, 0.0, tlats, tlons, **kwargs) == pytest.approx(
+            expected
+        )
+
+    def test_does_not_modify_inputs(self):
+        """The station coordinate lists are left untouched."""
+        tlats, tlons = [0.1], [0.2]
+        viz._get_extent(0.0, 0.0, tlats, tlons)
+        assert (tlats, tlons) == ([0.1], [0.2])
+
+
+class TestDistanceLabels:
+    """Test cases for formatting station distances."""
+
+    @pytest.mark.parametrize(
+        "unit,expected",
+        [
+            ("m", ["1,234,568 m", "5 m"]),
+            ("km", ["1,234.6 km", "0.0 km"]),
+            ("mi", ["767.1 mi", "0.0 mi"]),
+        ],
+    )
+    def test_units(self, unit, expected):
+        """Distances in meters are converted and formatted for each unit."""
+        assert viz._calculate_distance_labels([1234567.8, 5.0], unit) == expected
+
+    def test_empty(self):
+        """No distances give no labels."""
+        assert viz._calculate_distance_labels([], "km") == []
+
+    def test_invalid_unit(self):
+        """Unknown units are rejected."""
+        with pytest.raises(ValueError, match="Invalid distance unit"):
+            viz._calculate_distance_labels([1.0], "ft")